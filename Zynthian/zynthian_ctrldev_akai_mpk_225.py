@@ -55,6 +55,16 @@ CONST.MIDI_CC = 0xB0
 CONST.MIDI_PC = 0xC0
 CONST.MIDI_SYSEX = 0xF0
 
+# Status high nibbles, as seen by midi_event (ev[0] >> 4)
+_HN_NOTE_OFF = CONST.MIDI_NOTE_OFF >> 4
+_HN_NOTE_ON = CONST.MIDI_NOTE_ON >> 4
+_HN_CC = CONST.MIDI_CC >> 4
+_HN_PC = CONST.MIDI_PC >> 4
+
+# Absolute knobs (CC 50-57), the only CCs coalesced before dispatch
+_CC_KNOBS_START = 50
+_CC_KNOBS_END = 57
+
 # Function/State constants
 FN_VOLUME = 0x01
 FN_PAN = 0x02
@@ -62,6 +72,15 @@ FN_SOLO = 0x03
 FN_MUTE = 0x04
 FN_SELECT = 0x06
 
+# Absolute CC value -> normalized level (0..1) and balance (-1..1)
+_NORM = tuple(i / 127.0 for i in range(128))
+_BAL = tuple((i / 63.5) - 1.0 for i in range(128))
+
+
+def _noop(ev):
+    pass
+
+
 # --------------------------------------------------------------------------
 # 'Akai MPK 225' device controller class
 # --------------------------------------------------------------------------
@@ -73,15 +92,52 @@ class zynthian_ctrldev_akai_mpk_225(zynthian_ctrldev_zynmixer):
     unroute_from_chains = False
     autoload_flag = False
 
+    # Base classes keep their __dict__, these just speed up our own attributes
+    __slots__ = ("_mixer_handler", "_device_handler", "_pattern_handler",
+                 "_screen_handler", "_current_handler",
+                 "_handler_cc", "_handler_note_on", "_current_screen",
+                 "_dispatch", "_pending", "_flush_registered", "_signals")
+
+    # Requested slow-update period, in seconds. Knob values are delivered on
+    # the state manager's housekeeping tick, so a knob move takes effect up
+    # to one tick late; for level/balance sweeps only the final position
+    # matters and the mixer is spared the intermediate values.
+    CC_FLUSH_PERIOD = 0.1
+
     def __init__(self, state_manager, idev_in, idev_out):
         self._mixer_handler = MixerHandler(state_manager, idev_out)
         self._device_handler = DeviceHandler(state_manager, idev_out)
         self._pattern_handler = PatternHandler(state_manager, idev_out)
+        self._screen_handler = {
+            "mixer": self._mixer_handler,
+            "zynpad": self._mixer_handler,
+            "control": self._device_handler,
+            "preset": self._device_handler,
+            "main_menu": self._device_handler,
+            "admin": self._device_handler,
+            "pattern_editor": self._pattern_handler,
+            "arranger": self._pattern_handler,
+        }
         
         # Default to Mixer Handler
         self._current_handler = self._mixer_handler
+        self._handler_cc = self._current_handler.cc_change_with_channel
+        self._handler_note_on = {self._current_handler.CHAN_PADS: self._current_handler.note_on}
         self._current_screen = None
 
+        # Jump table keyed on the status nibble (MIDI data bytes are 0-127)
+        self._dispatch = {
+            _HN_NOTE_OFF: self._on_note_off,
+            _HN_NOTE_ON: self._on_note_on,
+            _HN_CC: self._on_cc,
+            _HN_PC: self._on_program_change,
+        }
+
+        # Knob CCs are coalesced on arrival, keyed on (status << 7) | ccnum,
+        # and drained by the slow-update callback (single consumer).
+        self._pending = {}
+        self._flush_registered = False
+
         self._signals = [
             (zynsigman.S_GUI,
                 zynsigman.SS_GUI_SHOW_SCREEN,
@@ -93,45 +149,68 @@ class zynthian_ctrldev_akai_mpk_225(zynthian_ctrldev_zynmixer):
         super().init()
         for signal, subsignal, callback in self._signals:
             zynsigman.register(signal, subsignal, callback)
-        
+        self.state_manager.add_slow_update_callback(self.CC_FLUSH_PERIOD, self._flush_pending)
+        self._flush_registered = True
+
         # Send a wake up / init message if needed?
         # For now, just log.
         logging.info("MPK 225 Driver Initialized. Please ensure Pads/Knobs are mapped to default CCs.")
 
     def end(self):
+        if self._flush_registered:
+            self.state_manager.remove_slow_update_callback(self._flush_pending)
+            self._flush_registered = False
         for signal, subsignal, callback in self._signals:
             zynsigman.unregister(signal, subsignal, callback)
         super().end()
 
     def midi_event(self, ev: bytes):
-        evtype = (ev[0] >> 4) & 0x0F
-        channel = ev[0] & 0x0F
-
-        if evtype == CONST.MIDI_CC:
-            ccnum = ev[1] & 0x7F
-            ccval = ev[2] & 0x7F
-            
-            # Dispatch to handler with channel info if available
-            if hasattr(self._current_handler, 'cc_change_with_channel'):
-                self._current_handler.cc_change_with_channel(channel, ccnum, ccval)
-            else:
-                self._current_handler.cc_change(ccnum, ccval)
-
-        elif evtype == CONST.MIDI_NOTE_ON:
-            note = ev[1] & 0x7F
-            velocity = ev[2] & 0x7F
-            self._current_handler.note_on(note, channel, velocity)
-
-        elif evtype == CONST.MIDI_NOTE_OFF:
-            note = ev[1] & 0x7F
-            self._current_handler.note_off(note, channel)
-            
-        elif evtype == CONST.MIDI_PC:
-             program = ev[1] & 0x7F
-             # Reserve PC 0-5 for Mode Switching if user configures it.
-             if program == 0: self._change_handler(self._mixer_handler)
-             elif program == 1: self._change_handler(self._device_handler)
-             elif program == 2: self._change_handler(self._pattern_handler)
+        # Absolute knobs only need their latest value: keep it for the flush.
+        # Buttons, pedals, notes and PCs are dispatched right away.
+        s0 = ev[0]
+        evtype = s0 >> 4
+        if evtype == _HN_CC and _CC_KNOBS_START <= ev[1] <= _CC_KNOBS_END:
+            self._pending[(s0 << 7) | ev[1]] = ev
+            return
+        self._dispatch.get(evtype, _noop)(ev)
+
+    def _flush_pending(self):
+        # Runs only on the slow-update thread. Keys are popped one by one
+        # rather than swapping the dict, so a value stored by the MIDI thread
+        # meanwhile is either delivered now or left for the next tick.
+        pending = self._pending
+        if not pending:
+            return
+        on_cc = self._on_cc
+        for key in list(pending):
+            ev = pending.pop(key, None)
+            if ev is not None:
+                on_cc(ev)
+
+    # Note and CC messages are always 3 bytes, so they are unpacked in one go
+    def _on_note_off(self, ev):
+        s0, s1, _ = ev
+        self._current_handler.note_off(s1, s0 & 0x0F)
+
+    def _on_note_on(self, ev):
+        # Handlers only get note-ons on their CHAN_PADS, keyboard notes stop here
+        s0, s1, s2 = ev
+        channel = s0 & 0x0F
+        cb = self._handler_note_on.get(channel)
+        if cb is not None:
+            cb(s1, channel, s2)
+
+    def _on_cc(self, ev):
+        s0, s1, s2 = ev
+        self._handler_cc(s0 & 0x0F, s1, s2)
+
+    def _on_program_change(self, ev):
+        # PC is a 2-byte message
+        program = ev[1]
+        # Reserve PC 0-5 for Mode Switching if user configures it.
+        if program == 0: self._change_handler(self._mixer_handler)
+        elif program == 1: self._change_handler(self._device_handler)
+        elif program == 2: self._change_handler(self._pattern_handler)
 
     def refresh(self):
         pass
@@ -147,21 +226,25 @@ class zynthian_ctrldev_akai_mpk_225(zynthian_ctrldev_zynmixer):
             return
         self._current_handler.set_active(False)
         self._current_handler = new_handler
+        self._handler_cc = new_handler.cc_change_with_channel
+        self._handler_note_on = {new_handler.CHAN_PADS: new_handler.note_on}
+        # Bring the new handler up to date with the screen shown meanwhile,
+        # before activation so set_active sees the current screen
+        if self._current_screen is not None:
+            new_handler.on_screen_change(self._current_screen)
         self._current_handler.set_active(True)
-        logging.info(f"Switched to {new_handler.__class__.__name__}")
+        logging.info("Switched to %s", new_handler.__class__.__name__)
 
     def _on_gui_show_screen(self, screen):
         self._current_screen = screen
-        for handler in [self._device_handler, self._mixer_handler, self._pattern_handler]:
-            handler.on_screen_change(screen)
-        
-        # Auto-switch handler based on screen?
-        if screen in ["mixer", "zynpad"]:
-            self._change_handler(self._mixer_handler)
-        elif screen in ["control", "preset", "main_menu", "admin"]:
-            self._change_handler(self._device_handler)
-        elif screen in ["pattern_editor", "arranger"]:
-            self._change_handler(self._pattern_handler)
+
+        # Auto-switch handler based on screen. Only the active handler tracks
+        # the screen, _change_handler catches up the one it switches to.
+        h = self._screen_handler.get(screen)
+        if h is not None and h is not self._current_handler:
+            self._change_handler(h)
+        else:
+            self._current_handler.on_screen_change(screen)
 
 
 # --------------------------------------------------------------------------
@@ -172,13 +255,16 @@ class zynthian_ctrldev_akai_mpk_225(zynthian_ctrldev_zynmixer):
 # --------------------------------------------------------------------------
 class MixerHandler(ModeHandlerBase):
 
+    __slots__ = ("_idev_out", "_send_cuia",
+                 "_chains_bank", "_last_cc")
+
     # Knobs (Channels 2, 3, 4)
     CHAN_KNOBS_A = 1
     CHAN_KNOBS_B = 2
     CHAN_KNOBS_C = 3
     
-    CC_KNOBS_START = 50
-    CC_KNOBS_END = 57
+    CC_KNOBS_START = _CC_KNOBS_START
+    CC_KNOBS_END = _CC_KNOBS_END
     
     # Pads (Channel 11 - 0x0A)
     CHAN_PADS = 10
@@ -187,6 +273,12 @@ class MixerHandler(ModeHandlerBase):
     NOTE_PAD_START_B = 44
     NOTE_PAD_END_B = 51
 
+    # Note -> pad tag: 0 = not a pad, 1-8 = Bank A, 9-16 = Bank B
+    _PAD_TABLE = bytearray(128)
+    _PAD_TABLE[NOTE_PAD_START_A:NOTE_PAD_END_A + 1] = range(1, 9)
+    _PAD_TABLE[NOTE_PAD_START_B:NOTE_PAD_END_B + 1] = range(9, 17)
+    _PAD_TABLE = bytes(_PAD_TABLE)
+
     # Switches (Channel 2)
     CC_SW_1 = 28
     CC_SW_2 = 29
@@ -202,89 +294,102 @@ class MixerHandler(ModeHandlerBase):
     CC_PLAY = 118
     CC_REC = 119
 
+    _TRANSPORT_CUIA = {
+        CC_STOP: "STOP_AUDIO_PLAY",
+        CC_PLAY: "TOGGLE_AUDIO_PLAY",
+        CC_REC: "TOGGLE_AUDIO_RECORD",
+        CC_LOOP: "TOGGLE_LOOP",
+        CC_FFW: "FORWARD",
+        CC_RWD: "BACKWARD",
+    }
+
     def __init__(self, state_manager, idev_out):
         super().__init__(state_manager)
         self._idev_out = idev_out
+        self._send_cuia = state_manager.send_cuia
         self._chains_bank = 0
+        # Last absolute value per knob (3 channels x 8 knobs), 0xFF = unseen
+        self._last_cc = bytearray(b"\xff" * 24)
 
     def note_on(self, note, channel, velocity):
-        if channel == self.CHAN_PADS:
-            # Bank A Pads (36-43) - Mute toggle 1-8
-            if self.NOTE_PAD_START_A <= note <= self.NOTE_PAD_END_A:
-                idx = note - self.NOTE_PAD_START_A
-                self._update_chain("mute_toggle", idx + self.CC_KNOBS_START, 127)
-            # Bank B Pads (44-51) - Solo toggle 1-8?
-            elif self.NOTE_PAD_START_B <= note <= self.NOTE_PAD_END_B:
-                idx = note - self.NOTE_PAD_START_B
-                self._update_chain("solo_toggle", idx + self.CC_KNOBS_START, 127)
+        t = self._PAD_TABLE[note]
+        if t == 0:
+            return
+        # Bank A Pads (36-43) - Mute toggle 1-8
+        if t <= 8:
+            self._toggle_chain_mute(t - 1 + self.CC_KNOBS_START)
+        # Bank B Pads (44-51) - Solo toggle 1-8?
+        else:
+            self._toggle_chain_solo(t - 9 + self.CC_KNOBS_START)
 
     def cc_change_with_channel(self, channel, ccnum, ccval):
         # Transport (Channel 1)
         if channel == self.CHAN_TRANSPORT:
-            if ccnum == self.CC_STOP: self._state_manager.send_cuia("STOP_AUDIO_PLAY")
-            elif ccnum == self.CC_PLAY: self._state_manager.send_cuia("TOGGLE_AUDIO_PLAY")
-            elif ccnum == self.CC_REC: self._state_manager.send_cuia("TOGGLE_AUDIO_RECORD")
-            elif ccnum == self.CC_LOOP: self._state_manager.send_cuia("TOGGLE_LOOP")
-            elif ccnum == self.CC_FFW: self._state_manager.send_cuia("FORWARD")
-            elif ccnum == self.CC_RWD: self._state_manager.send_cuia("BACKWARD")
+            cuia = self._TRANSPORT_CUIA.get(ccnum)
+            if cuia:
+                self._send_cuia(cuia)
             return
 
         # Knobs (Channels 2, 3, 4)
         if self.CC_KNOBS_START <= ccnum <= self.CC_KNOBS_END:
+            if not self.CHAN_KNOBS_A <= channel <= self.CHAN_KNOBS_C:
+                return
+            # Skip knob ticks that repeat the last value
+            key = (channel - self.CHAN_KNOBS_A) * 8 + ccnum - self.CC_KNOBS_START
+            if self._last_cc[key] == ccval:
+                return
+            self._last_cc[key] = ccval
+
             if channel == self.CHAN_KNOBS_A:
-                self._update_volume(ccnum, ccval)
+                self._set_chain_level(ccnum, ccval)
             elif channel == self.CHAN_KNOBS_B:
-                self._update_pan(ccnum, ccval)
+                self._set_chain_balance(ccnum, ccval)
             elif channel == self.CHAN_KNOBS_C:
                 self._update_send(ccnum, ccval)
     
     def cc_change(self, ccnum, ccval):
         pass
 
-    def _update_volume(self, ccnum, ccval):
-        return self._update_chain("level", ccnum, ccval, 0, 100)
-
-    def _update_pan(self, ccnum, ccval):
-        return self._update_chain("balance", ccnum, ccval, -100, 100)
-    
     def _update_send(self, ccnum, ccval):
         # Placeholder
         pass
 
-    def _update_chain(self, type, ccnum, ccval, minv=None, maxv=None):
+    def _get_chain(self, ccnum):
         index = ccnum - self.CC_KNOBS_START + self._chains_bank * 8
         chain = self._chain_manager.get_chain_by_index(index)
         if chain is None or chain.chain_id == 0:
-            return False
-        mixer_chan = chain.mixer_chan
-
-        if type == "level":
-            value = self._zynmixer.get_level(mixer_chan)
-            set_value = self._zynmixer.set_level
-        elif type == "balance":
-            value = self._zynmixer.get_balance(mixer_chan)
-            set_value = self._zynmixer.set_balance
-        elif type == "mute_toggle":
-            value = not self._zynmixer.get_mute(mixer_chan)
-            self._zynmixer.set_mute(mixer_chan, value, True)
-            return True
-        elif type == "solo_toggle":
-            value = not chain.solo
-            chain.set_solo(value)
-            return True
-
-        if minv is not None and maxv is not None:
-             value = minv + (ccval / 127.0) * (maxv - minv)
-        
-        if 'set_value' in locals():
-            set_value(mixer_chan, value)
-        return True
+            return None
+        return chain
+
+    def _set_chain_level(self, ccnum, ccval):
+        chain = self._get_chain(ccnum)
+        if chain is not None:
+            self._zynmixer.set_level(chain.mixer_chan, _NORM[ccval])
+
+    def _set_chain_balance(self, ccnum, ccval):
+        chain = self._get_chain(ccnum)
+        if chain is not None:
+            self._zynmixer.set_balance(chain.mixer_chan, _BAL[ccval])
+
+    def _toggle_chain_mute(self, ccnum):
+        chain = self._get_chain(ccnum)
+        if chain is not None:
+            mixer_chan = chain.mixer_chan
+            self._zynmixer.set_mute(mixer_chan, not self._zynmixer.get_mute(mixer_chan), True)
+
+    def _toggle_chain_solo(self, ccnum):
+        chain = self._get_chain(ccnum)
+        if chain is not None:
+            chain.set_solo(not chain.solo)
 
 
 # --------------------------------------------------------------------------
 # Handle GUI (Device mode)
 # --------------------------------------------------------------------------
 class DeviceHandler(ModeHandlerBase):
+
+    __slots__ = ("_idev_out", "_send_cuia",
+                 "_last_cc_values", "_cc_seen")
     
     # Pads (Channel 10)
     CHAN_PADS = 10
@@ -297,25 +402,32 @@ class DeviceHandler(ModeHandlerBase):
     NOTE_PAD_SNAPSHOT = 42   # Pad A07
     NOTE_PAD_LAYER = 43      # Pad A08
 
+    _PAD_CUIA = {
+        NOTE_PAD_UP: "ARROW_UP",
+        NOTE_PAD_DOWN: "ARROW_DOWN",
+        NOTE_PAD_LEFT: "ARROW_LEFT",
+        NOTE_PAD_RIGHT: "ARROW_RIGHT",
+        NOTE_PAD_BACK: "BACK",
+        NOTE_PAD_SELECT: "SELECT",
+        NOTE_PAD_SNAPSHOT: "SCREEN_ZS3",
+        NOTE_PAD_LAYER: "LAYER_TOGGLE",
+    }
+
     # Knobs (Channel 1, 2, 3) - CC 50-57
     # Bank A -> Knobs 1-8
     
     def __init__(self, state_manager, idev_out):
         super().__init__(state_manager)
         self._idev_out = idev_out
-        self._last_cc_values = {}
+        self._send_cuia = state_manager.send_cuia
+        # Last absolute value and first-touch flag, indexed by (channel << 7) | ccnum
+        self._last_cc_values = bytearray(2048)
+        self._cc_seen = bytearray(2048)
 
     def note_on(self, note, channel, velocity):
-        if channel != self.CHAN_PADS: return
-        
-        if note == self.NOTE_PAD_UP: self._state_manager.send_cuia("ARROW_UP")
-        elif note == self.NOTE_PAD_DOWN: self._state_manager.send_cuia("ARROW_DOWN")
-        elif note == self.NOTE_PAD_LEFT: self._state_manager.send_cuia("ARROW_LEFT")
-        elif note == self.NOTE_PAD_RIGHT: self._state_manager.send_cuia("ARROW_RIGHT")
-        elif note == self.NOTE_PAD_BACK: self._state_manager.send_cuia("BACK")
-        elif note == self.NOTE_PAD_SELECT: self._state_manager.send_cuia("SELECT")
-        elif note == self.NOTE_PAD_SNAPSHOT: self._state_manager.send_cuia("SCREEN_ZS3")
-        elif note == self.NOTE_PAD_LAYER: self._state_manager.send_cuia("LAYER_TOGGLE")
+        cuia = self._PAD_CUIA.get(note)
+        if cuia:
+            self._send_cuia(cuia)
 
     def cc_change_with_channel(self, channel, ccnum, ccval):
         # We need channel info for Knobs to distinguish Banks if we map them differently
@@ -334,16 +446,15 @@ class DeviceHandler(ModeHandlerBase):
             pot_idx = ccnum - 50 + pot_offset
             
             # Absolute to Delta
-            last_val = self._last_cc_values.get((channel, ccnum), ccval)
-            delta = ccval - last_val
-            
-            if (channel, ccnum) not in self._last_cc_values:
-                delta = 0 # suppress jump on first touch
-            
-            self._last_cc_values[(channel, ccnum)] = ccval
-            
+            key = (channel << 7) | ccnum
+            last_val = self._last_cc_values[key]
+            seen = self._cc_seen[key]
+            self._last_cc_values[key] = ccval
+            self._cc_seen[key] = 1
+            delta = ccval - last_val if seen else 0 # suppress jump on first touch
+
             if delta != 0:
-                self._state_manager.send_cuia("ZYNPOT", [pot_idx, delta])
+                self._send_cuia("ZYNPOT", [pot_idx, delta])
 
 
 
@@ -351,6 +462,9 @@ class DeviceHandler(ModeHandlerBase):
 # Handle pattern editor (Pattern mode)
 # --------------------------------------------------------------------------
 class PatternHandler(ModeHandlerBase):
+
+    __slots__ = ("_idev_out", "_send_cuia",
+                 "_knobs_ease")
     
     # Pads (Channel 11 - 0x0A)
     CHAN_PADS = 10
@@ -364,22 +478,34 @@ class PatternHandler(ModeHandlerBase):
     CC_STOP = 117
     CC_REC = 119
 
+    _PAD_CUIA = {
+        NOTE_PAD_PLAY: "TOGGLE_PLAY",
+        NOTE_PAD_STOP: "STOP",
+        NOTE_PAD_REC: "TOGGLE_RECORD",
+    }
+
+    _TRANSPORT_CUIA = {
+        CC_PLAY: "TOGGLE_PLAY",
+        CC_STOP: "STOP",
+        CC_REC: "TOGGLE_RECORD",
+    }
+
     def __init__(self, state_manager, idev_out):
         super().__init__(state_manager)
         self._idev_out = idev_out
+        self._send_cuia = state_manager.send_cuia
         self._knobs_ease = KnobSpeedControl()
 
     def note_on(self, note, channel, velocity):
-        if channel == self.CHAN_PADS:
-             if note == self.NOTE_PAD_PLAY: self._state_manager.send_cuia("TOGGLE_PLAY")
-             elif note == self.NOTE_PAD_STOP: self._state_manager.send_cuia("STOP")
-             elif note == self.NOTE_PAD_REC: self._state_manager.send_cuia("TOGGLE_RECORD")
+        cuia = self._PAD_CUIA.get(note)
+        if cuia:
+            self._send_cuia(cuia)
 
     def cc_change_with_channel(self, channel, ccnum, ccval):
         if channel == self.CHAN_TRANSPORT:
-            if ccnum == self.CC_PLAY: self._state_manager.send_cuia("TOGGLE_PLAY")
-            elif ccnum == self.CC_STOP: self._state_manager.send_cuia("STOP")
-            elif ccnum == self.CC_REC: self._state_manager.send_cuia("TOGGLE_RECORD")
+            cuia = self._TRANSPORT_CUIA.get(ccnum)
+            if cuia:
+                self._send_cuia(cuia)
 
     def cc_change(self, ccnum, ccval):
         pass